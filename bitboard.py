@@ -0,0 +1,219 @@
+"""Bitboard functions of Reversi
+
+Module Description
+===============================
+
+This module contains the functions operating on the bitboards used by ReversiGame to represent
+the pieces of each side.
+
+Copyright and Usage Information
+===============================
+
+Authors:
+    - Haoze Deng
+    - Peifeng Zhang
+    - Man Chon Ho
+    - Alexander Nicholas Conway
+
+This file is Copyright (c) 2021.
+"""
+from __future__ import annotations
+
+from typing import Iterator
+import functools
+
+# A board is stored as two bitboards, one int for the pieces of each side. The square at
+# array indices (y, x) is represented by bit y * 8 + x, so 'a1' is bit 0 and 'h8' is bit 63.
+# A board of size 6 uses the same layout, with the squares outside of the board always empty.
+_ALL_SQUARES = (1 << 64) - 1
+_NOT_A_FILE = 0xfefefefefefefefe  # every square except those with x == 0
+_NOT_H_FILE = 0x7f7f7f7f7f7f7f7f  # every square except those with x == 7
+
+# the eight directions as (shift, mask), where a positive shift moves the bits towards h8 and
+# a negative shift moves them towards a1. The mask removes the squares a shifted piece could
+# only reach by wrapping around to the other side of the board
+_SHIFTS = ((1, _NOT_A_FILE), (-1, _NOT_H_FILE), (8, _ALL_SQUARES), (-8, _ALL_SQUARES),
+           (9, _NOT_A_FILE), (7, _NOT_H_FILE), (-7, _NOT_A_FILE), (-9, _NOT_H_FILE))
+
+
+def _calculate_board_mask(size: int) -> int:
+    """Return the bitboard of all the squares on a size * size board.
+
+    :param size: the size of the board
+    """
+    row_mask = (1 << size) - 1
+    board_mask = 0
+    for y in range(size):
+        board_mask |= row_mask << (y * 8)
+    return board_mask
+
+
+def _shift(bitboard: int, shift: int) -> int:
+    """Return the bitboard shifted by the given amount, to the left if shift is positive and to
+    the right if shift is negative.
+
+    The result may contain bits outside of the board, which are removed by the caller.
+    """
+    if shift > 0:
+        return bitboard << shift
+    else:
+        return bitboard >> -shift
+
+
+def _moves_in_direction(player: int, opponent: int, empty: int, shift: int, mask: int) -> int:
+    """Return the bitboard of the valid moves of the player which flip pieces in the direction
+    of the given shift.
+
+    The check is done for all the squares of the board at once: the player pieces are spread
+    over the adjacent opponent pieces in the direction, and the empty squares reached right
+    after them are valid moves. At most 6 opponent pieces can be enclosed in a line, so the
+    pieces are spread 6 times.
+
+    Preconditions:
+        - (shift, mask) is one of the directions of _SHIFTS, restricted to the board
+
+    :param player: the bitboard of the pieces of the player making the move
+    :param opponent: the bitboard of the pieces of the opponent
+    :param empty: the bitboard of the empty squares of the board
+    :param shift: the shift of the direction
+    :param mask: the squares reachable by the shift
+    """
+    opponent &= mask
+    empty &= mask
+    if shift > 0:
+        line = opponent & (player << shift)
+        line |= opponent & (line << shift)
+        line |= opponent & (line << shift)
+        line |= opponent & (line << shift)
+        line |= opponent & (line << shift)
+        line |= opponent & (line << shift)
+        return empty & (line << shift)
+    else:
+        shift = -shift
+        line = opponent & (player >> shift)
+        line |= opponent & (line >> shift)
+        line |= opponent & (line >> shift)
+        line |= opponent & (line >> shift)
+        line |= opponent & (line >> shift)
+        line |= opponent & (line >> shift)
+        return empty & (line >> shift)
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def calculate_moves(player: int, opponent: int, board_mask: int) -> int:
+    """Return the bitboard of all valid moves other than pass of the player.
+
+    The results are cached, since the AIs reach the same positions by different move orders
+    and check the valid moves of a position many times.
+
+    :param player: the bitboard of the pieces of the player making the move
+    :param opponent: the bitboard of the pieces of the opponent
+    :param board_mask: the bitboard of all the squares on the board
+    """
+    empty = board_mask & ~(player | opponent)
+    moves = 0
+    for shift, mask in _SHIFTS:
+        moves |= _moves_in_direction(player, opponent, empty, shift, mask & board_mask)
+    return moves
+
+
+def iter_squares(bitboard: int) -> Iterator[int]:
+    """Yield the index of every set bit of the bitboard, from the lowest to the highest.
+
+    :param bitboard: the bitboard to iterate over
+    """
+    while bitboard:
+        square = bitboard & -bitboard  # the lowest set bit
+        yield square.bit_length() - 1
+        bitboard ^= square
+
+
+def _calculate_rays(board_mask: int, positive: bool) -> tuple[tuple[int, ...], ...]:
+    """Return, for every square, the bitboards of the rays walking from the square to the
+    border of the board in each direction with a positive shift, or in each direction with a
+    negative shift. The square itself is not part of its rays.
+
+    A move can only flip pieces along a ray of at least 2 squares, so the shorter rays are left
+    out and the flips of the squares near the border check fewer rays.
+
+    :param board_mask: the bitboard of all the squares on the board
+    :param positive: whether to return the rays of the directions with a positive shift
+    """
+    rays = []
+    for square in range(64):
+        square_rays = []
+        for shift, mask in _SHIFTS:
+            if (shift > 0) == positive:
+                ray = 0
+                ray_square = _shift(1 << square, shift) & mask & board_mask
+                while ray_square:
+                    ray |= ray_square
+                    ray_square = _shift(ray_square, shift) & mask & board_mask
+                if ray & (ray - 1):  # the ray has at least 2 squares
+                    square_rays.append(ray)
+        rays.append(tuple(square_rays))
+    return tuple(rays)
+
+
+def calculate_flips(player: int, opponent: int, square: int, size: int) -> int:
+    """Return the bitboard of the opponent pieces flipped when the player plays a move on the
+    square with the given index.
+
+    On a ray, the flipped pieces are the opponent pieces between the move and the first square
+    without an opponent piece, if that square holds a player piece. Along a ray towards h8, this
+    first square is found by an addition whose carry runs over the opponent pieces. Along a ray
+    towards a1, it is the highest square of the ray without an opponent piece.
+
+    Preconditions:
+        - size in {6, 8}
+        - the square with the given index is empty and on the board
+
+    :param player: the bitboard of the pieces of the player making the move
+    :param opponent: the bitboard of the pieces of the opponent
+    :param square: the index of the square of the move
+    :param size: the size of the board
+    """
+    flips = 0
+    for ray in _POSITIVE_RAYS[size][square]:
+        outflank = ((opponent & ray | ~ray) + 1) & ray & player
+        if outflank:
+            flips |= (outflank - 1) & ray
+    for ray in _NEGATIVE_RAYS[size][square]:
+        blockers = ray & ~opponent
+        if blockers:
+            outflank = 1 << (blockers.bit_length() - 1)
+            if outflank & player:
+                flips |= ray & ~((outflank << 1) - 1)
+    return flips
+
+
+def _popcount(bitboard: int) -> int:
+    """Return the number of set bits of the bitboard.
+
+    :param bitboard: the bitboard to count the bits of
+    """
+    return bin(bitboard).count('1')
+
+
+# the number of set bits of a bitboard, counted by int.bit_count from Python 3.10 onwards
+popcount = getattr(int, 'bit_count', _popcount)
+
+
+# the bitboards of all the squares for every supported board size
+BOARD_MASKS = {size: _calculate_board_mask(size) for size in (6, 8)}
+
+# the precomputed rays of every square for every supported board size
+_POSITIVE_RAYS = {size: _calculate_rays(BOARD_MASKS[size], True) for size in (6, 8)}
+_NEGATIVE_RAYS = {size: _calculate_rays(BOARD_MASKS[size], False) for size in (6, 8)}
+
+
+if __name__ == '__main__':
+    import python_ta
+    import python_ta.contracts
+
+    python_ta.contracts.check_all_contracts()
+    python_ta.check_all(config={
+        'extra-imports': ['typing', 'functools'],
+        'max-line-length': 100,
+        'disable': ['E1136']
+    })
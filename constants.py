@@ -22,6 +22,11 @@ EMPTY = '_'
 BLACK = 'X'
 WHITE = 'O'
 
+# representation of pieces on the flat board returned by ReversiGame.get_flat_board
+FLAT_EMPTY = 0
+FLAT_BLACK = 1
+FLAT_WHITE = 2
+
 # mapping used for converting move between algebraic and index
 COL_TO_INDEX = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5, 'g': 6, 'h': 7}
 INDEX_TO_COL = {i: f for f, i in COL_TO_INDEX.items()}
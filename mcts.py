@@ -241,9 +241,11 @@ class MCTSRoundPlayer(Player):
     #     - _round: The number of round of MCTS performed on each move
     #     - _tree: The decision tree for this player to make its moves
     #     - _c: The exploration parameter for the MCTS algorithm
+    #     - _stopped: Whether the player was asked to stop the search of the running make_move
     _n: int
     _tree: Optional[MCTSTree]
     _c: Union[float, int]
+    _stopped: bool
 
     def __init__(self, n: Union[int, float], tree: Optional[MCTSTree] = None,
                  c: Union[float, int] = math.sqrt(2)) -> None:
@@ -256,6 +258,13 @@ class MCTSRoundPlayer(Player):
         self._n = n
         self._tree = tree
         self._c = c
+        self._stopped = False
+
+    def stop(self) -> None:
+        """Ask the player to stop running MCTS in the running make_move. The round being run is
+        finished, and a move is chosen from the rounds run so far.
+        """
+        self._stopped = True
 
     def make_move(self, game: ReversiGame, previous_move: Optional[str]) -> str:
         """Make a move given the current game.
@@ -286,8 +295,14 @@ class MCTSRoundPlayer(Player):
         assert self._tree.get_game_after_move().get_game_board() == game.get_game_board()
         assert self._tree.get_game_after_move().get_current_player() == game.get_current_player()
 
-        for _ in range(self._n):
-            self._tree.mcts_round(self._c)
+        try:
+            for _ in range(self._n):
+                self._tree.mcts_round(self._c)
+                if self._stopped:
+                    break
+        finally:
+            # a stop only cuts short the search it was asked for
+            self._stopped = False
 
         # update tree with the decided move
         move = self._tree.get_most_confident_move()
@@ -301,9 +316,11 @@ class MCTSTimerPlayer(Player):
     #     - _tree: The decision tree for this player to make its moves
     #     - _c: The exploration parameter for the MCTS algorithm
     #     - _time_limit: The time limit for each move
+    #     - _stopped: Whether the player was asked to stop the search of the running make_move
     _tree: Optional[MCTSTree]
     _c: Union[float, int]
     _time_limit: Union[int, float]
+    _stopped: bool
 
     def __init__(self, time_limit: Union[int, float], tree: Optional[MCTSTree] = None,
                  c: Union[float, int] = math.sqrt(2)) -> None:
@@ -316,6 +333,13 @@ class MCTSTimerPlayer(Player):
         self._time_limit = time_limit
         self._tree = tree
         self._c = c
+        self._stopped = False
+
+    def stop(self) -> None:
+        """Ask the player to stop running MCTS in the running make_move. The round being run is
+        finished, and a move is chosen from the rounds run so far.
+        """
+        self._stopped = True
 
     def make_move(self, game: ReversiGame, previous_move: Optional[str]) -> str:
         """Make a move given the current game.
@@ -347,8 +371,14 @@ class MCTSTimerPlayer(Player):
         # assert self._tree.get_game_after_move().get_current_player() == game.get_current_player()
 
         time_start = time.time()
-        while time.time() - time_start < self._time_limit:
-            self._tree.mcts_round(self._c)
+        try:
+            while time.time() - time_start < self._time_limit:
+                self._tree.mcts_round(self._c)
+                if self._stopped:
+                    break
+        finally:
+            # a stop only cuts short the search it was asked for
+            self._stopped = False
 
         # update tree with the decided move
         move = self._tree.get_most_confident_move()
@@ -366,12 +396,15 @@ class MCTSTimeSavingPlayer(Player):
         - n: the number of MCTS runs per turn
         - time_limit: the time limit for each move
     """
+    STATELESS = True
     n: int
     time_limit: Union[int, float]
 
     # Private Instance Attributes:
     #     - _c: The exploration parameter for the MCTS algorithm
+    #     - _stopped: Whether the player was asked to stop the search of the running make_move
     _c: Union[float, int]
+    _stopped: bool
 
     def __init__(self, n: Union[int, float], time_limit: Union[int, float],
                  c: Union[float, int] = math.sqrt(2)) -> None:
@@ -384,6 +417,13 @@ class MCTSTimeSavingPlayer(Player):
         self.n = n
         self.time_limit = time_limit
         self._c = c
+        self._stopped = False
+
+    def stop(self) -> None:
+        """Ask the player to stop running MCTS in the running make_move. The round being run is
+        finished, and a move is chosen from the rounds run so far.
+        """
+        self._stopped = True
 
     def make_move(self, game: ReversiGame, previous_move: Optional[str]) -> str:
         """Make a move given the current game.
@@ -415,9 +455,16 @@ class MCTSTimeSavingPlayer(Player):
         time_start = time.time()
 
         # at least run 1 second, ends when exceeds time limit or finishes n runs
-        while not (time.time() - time_start > max(self.time_limit, 1) or runs_so_far == self.n):
-            tree.mcts_round(self._c)
-            runs_so_far += 1
+        try:
+            while not (time.time() - time_start > max(self.time_limit, 1)
+                       or runs_so_far == self.n):
+                tree.mcts_round(self._c)
+                runs_so_far += 1
+                if self._stopped:
+                    break
+        finally:
+            # a stop only cuts short the search it was asked for
+            self._stopped = False
 
         # update tree with the decided move
         move = tree.get_most_confident_move()
@@ -20,12 +20,19 @@ This file is Copyright (c) 2021.
 """
 from __future__ import annotations
 from typing import Optional, Union
+import copy
 import math
 import random
 
-from constants import BLACK, WHITE, BOARD_WEIGHT_8, BOARD_WEIGHT_6
+from constants import BLACK, WHITE, BOARD_WEIGHT_8, BOARD_WEIGHT_6, FLAT_BLACK, FLAT_WHITE
 from reversi import ReversiGame, Player
 
+# the weight of every square of the flat board of every board size, where the squares of the last
+# row and the last column, which are not counted by positional_early, weigh 0
+_FLAT_BOARD_WEIGHTS = {size: tuple(weights[y][x] if y < size - 1 and x < size - 1 else 0
+                                   for y in range(size) for x in range(size))
+                       for size, weights in ((8, BOARD_WEIGHT_8), (6, BOARD_WEIGHT_6))}
+
 
 class MinimaxTree:
     """A tree representing a state of a Reversi Game"""
@@ -91,12 +98,23 @@ class TreePlayer(Player):
 
     Instance Attributes:
         _depth : How many moves forward the player should simulate
+        _stopped : Whether the player was asked to stop the search of the running make_move
     """
 
+    STATELESS = True
     _depth: int
+    _stopped: bool
 
     def __init__(self, depth: int) -> None:
         self._depth = depth
+        self._stopped = False
+
+    def stop(self) -> None:
+        """Ask the player to cut the search of the running make_move short. Every node searched
+        afterwards only builds its first subtree, so make_move returns after a few more
+        evaluations.
+        """
+        self._stopped = True
 
     def make_move(self, game: ReversiGame, previous_move: Optional[str]) -> str:
         """Make a move given the current game.
@@ -114,15 +132,34 @@ class TreePlayer(Player):
         :return: a move to be made
         """
         piece = game.get_current_player()
-        tree = self.build_minimax_tree(game, piece, depth=self._depth, find_max=True,
-                                       previous_move=previous_move)
+        try:
+            tree = self.build_minimax_tree(game, piece, depth=self._depth, find_max=True,
+                                           previous_move=previous_move)
+        finally:
+            # a stop only cuts short the search it was asked for
+            self._stopped = False
         return tree.get_best()
 
     def build_minimax_tree(self, game: ReversiGame, piece: str,
                            depth: int, find_max: bool, previous_move: str, alpha: float = -math.inf,
                            beta: float = math.inf) -> MinimaxTree:
         """Construct a tree with a height of depth, prune branches based on the Tree's
-        evaluate function"""
+        evaluate function
+
+        The search is done on a private copy of game, so game is never mutated, even while the
+        tree is being built.
+        """
+        return self._build_minimax_tree(copy.copy(game), piece, depth, find_max, previous_move,
+                                        alpha, beta)
+
+    def _build_minimax_tree(self, game: ReversiGame, piece: str,
+                            depth: int, find_max: bool, previous_move: str, alpha: float,
+                            beta: float) -> MinimaxTree:
+        """Construct the tree of build_minimax_tree.
+
+        Every move is made on game itself and undone once its subtree is built, so game is
+        mutated during the search but is back to its original state when this returns.
+        """
         game_tree = MinimaxTree(move=previous_move, maximize=find_max, alpha=alpha, beta=beta)
 
         if game.get_winner() is not None or depth == 0:
@@ -132,14 +169,14 @@ class TreePlayer(Player):
             random.shuffle(valid_moves)
             for move in valid_moves:
 
-                game_after_move = game.simulate_move(move)
-                subtree = self.build_minimax_tree(game_after_move, piece, depth - 1,
-                                                  not find_max, move, alpha=game_tree.alpha,
-                                                  beta=game_tree.beta)
+                with game.with_move(move):
+                    subtree = self._build_minimax_tree(game, piece, depth - 1,
+                                                       not find_max, move, alpha=game_tree.alpha,
+                                                       beta=game_tree.beta)
 
                 game_tree.add_subtree(subtree)
 
-                if game_tree.beta <= game_tree.alpha:
+                if game_tree.beta <= game_tree.alpha or self._stopped:
                     break
 
         return game_tree
@@ -203,13 +240,9 @@ class PositionalTreePlayer(TreePlayer):
         else:
             num_black, num_white = game.get_num_pieces()[BLACK], game.get_num_pieces()[WHITE]
             board_filled = (num_black + num_white) / (game.get_size() ** 2)
-            if game.get_size() == 8:
-                selected_board_weight = BOARD_WEIGHT_8
-            else:
-                selected_board_weight = BOARD_WEIGHT_6
 
         if board_filled < 0.80:
-            return positional_early(game, selected_board_weight, piece)
+            return positional_early(game, piece)
         else:
             if piece == BLACK:
                 return num_black / num_white
@@ -220,27 +253,23 @@ class PositionalTreePlayer(TreePlayer):
         return 0
 
 
-def positional_early(game: ReversiGame, selected_board_weight: list,
-                     player: str) -> Union[float, int]:
+def positional_early(game: ReversiGame, player: str) -> Union[float, int]:
     """Evaluates a board based on the positional advantage of black
 
     Preconditions:
         player in {BLACK, WHITE}
     """
+    eval_so_far = 0
+    for square, weight in zip(game.get_flat_board(), _FLAT_BOARD_WEIGHTS[game.get_size()]):
+        if square == FLAT_BLACK:
+            eval_so_far += weight
+        elif square == FLAT_WHITE:
+            eval_so_far -= weight
+
     if player == BLACK:
-        opponent = WHITE
+        return eval_so_far
     else:
-        opponent = BLACK
-
-    eval_so_far = 0
-    board = game.get_game_board()
-    for i in range(game.get_size() - 1):
-        for j in range(game.get_size() - 1):
-            if board[i][j] == player:
-                eval_so_far += selected_board_weight[i][j]
-            elif board[i][j] == opponent:
-                eval_so_far -= selected_board_weight[i][j]
-    return eval_so_far
+        return -eval_so_far
 
 
 class MobilityTreePlayer(TreePlayer):
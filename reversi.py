@@ -19,11 +19,13 @@ This file is Copyright (c) 2021.
 """
 from __future__ import annotations
 
-from typing import Optional
+from typing import Iterator, Optional
+import contextlib
 import copy
 import random
 
-from constants import BLACK, WHITE, EMPTY, algebraic_to_index, index_to_algebraic
+from constants import BLACK, WHITE, EMPTY, FLAT_BLACK, FLAT_WHITE, FLAT_EMPTY
+from bitboard import BOARD_MASKS, calculate_moves, calculate_flips, iter_squares, popcount
 
 ################################################################################
 # Class representing Reversi
@@ -34,64 +36,103 @@ _INDEX_TO_COL = {i: f for f, i in _COL_TO_INDEX.items()}
 _ROW_TO_INDEX = {'1': 0, '2': 1, '3': 2, '4': 3, '5': 4, '6': 5, '7': 6, '8': 7}
 _INDEX_TO_ROW = {i: r for r, i in _ROW_TO_INDEX.items()}
 
+# the algebraic notation of every square index of the bitboards, and the other way around
+_ALG_FROM_SQ = tuple(_INDEX_TO_COL[x] + _INDEX_TO_ROW[y] for y in range(8) for x in range(8))
+_SQ_FROM_ALG = {move: square for square, move in enumerate(_ALG_FROM_SQ)}
+
+# mapping from each piece to the piece of its opponent
+_OPPONENT = {BLACK: WHITE, WHITE: BLACK}
+
+
+def _calculate_rows(size: int) -> dict[int, tuple[str, ...]]:
+    """Return a mapping from every possible row of a size * size board to the pieces of the
+    row. A row is keyed by the 8 bits of the black pieces of the row followed by the 8 bits of
+    the white pieces.
+
+    :param size: the size of the board
+    """
+    rows = {0: ()}
+    for x in range(size):
+        # add the square x to the end of every row of the first x squares
+        new_rows = {}
+        for key, row in rows.items():
+            new_rows[key] = row + (EMPTY,)
+            new_rows[key | (1 << (x + 8))] = row + (BLACK,)
+            new_rows[key | (1 << x)] = row + (WHITE,)
+        rows = new_rows
+    return rows
+
+
+# the border line printed above and below the game state on the console
+_BORDER = '*' * 26
+
+
+def _calculate_starting_position(size: int) -> tuple[int, int, int]:
+    """Return the bitboards of the black pieces, the white pieces and the valid moves of black
+    at the start of a game on a size * size board.
+
+    :param size: the size of the board
+    """
+    # calculate the bit of the top left center square
+    top_left = (size // 2 - 1) * 8 + size // 2 - 1
+
+    # place 2 black and 2 white pieces on the center
+    black = (1 << (top_left + 1)) | (1 << (top_left + 8))
+    white = (1 << top_left) | (1 << (top_left + 9))
+    return black, white, calculate_moves(black, white, BOARD_MASKS[size])
+
+
+# the column header printed above the board for every supported board size
+_HEADERS = {size: '   ' + '  '.join('abcdefgh'[:size]) for size in (6, 8)}
+
+# the pieces of every possible row for every supported board size
+_ROWS = {size: _calculate_rows(size) for size in (6, 8)}
+
+# the pieces of every possible row for every supported board size, as rows of the flat board
+_FLAT_PIECES = {EMPTY: FLAT_EMPTY, BLACK: FLAT_BLACK, WHITE: FLAT_WHITE}
+_FLAT_ROWS = {size: {key: bytes(_FLAT_PIECES[piece] for piece in row)
+                     for key, row in _ROWS[size].items()}
+              for size in (6, 8)}
+
+# the starting position of every supported board size
+_STARTING_POSITIONS = {size: _calculate_starting_position(size) for size in (6, 8)}
+
 
 class ReversiGame:
     """A class representing a state of a game of Reversi.
     """
     # Private Instance Attributes:
-    #   - _board: a two-dimensional nested list representing a Reversi board
-    #   - _valid_moves: a list of the valid moves of the current player
+    #   - _black: the bitboard of the black pieces
+    #   - _white: the bitboard of the white pieces
+    #   - _valid_moves_bb: the bitboard of the valid moves other than pass of the current player,
+    #                      or None if they have not been calculated yet
     #   - _turn: a str representing which piece is going to play next
-    #   - _num_pieces: a dictionary representing the number of pieces of either side
+    #   - _size: the size of the board
 
     # Representation Invariants:
-    #   - len(self_board) == 8 or len(self_board) == 8
-    #   - all(len(row) == 8 for row in self._board)
-    #   - all elements in the inner lists of self._board is in {EMPTY, BLACK, WHITE}
+    #   - self._size in {6, 8}
+    #   - self._black & self._white == 0
+    #   - (self._black | self._white) & ~BOARD_MASKS[self._size] == 0
     #   - self._turn in {BLACK, WHITE}
-    _board: list[list[str]]
-    _valid_moves: list[str]
+    __slots__ = ('_black', '_white', '_valid_moves_bb', '_turn', '_size')
+    _black: int
+    _white: int
+    _valid_moves_bb: Optional[int]
     _turn: str
-    _num_pieces: dict[str, int]
     _size: int
 
     def __init__(self, size: int) -> None:
-        """Initialize a game with the given state. The board is empty if board is None.
-
-        Representation Invariants:
-            - board is None or len(_board) == 8 or len(_board) == 6
-            - board is None or all(len(row) == 8 for row in _board)
-            - board is None or every element in the inner lists of _board is in
-            {EMPTY, BLACK, WHITE}
-            - turn in {BLACK, WHITE}
+        """Initialize a game with the starting position on a size * size board.
 
         Precondition:
             - size in {6, 8}    # ValueError if this is not met
         """
         self._size = size
-        self._board = []
-
-        if size in (8, 6):
-            # create an empty size * size board
-            for _ in range(size):
-                self._board.append([EMPTY] * size)
-
-            # calculate center coordinates
-            top_left_y, top_left_x = size // 2 - 1, size // 2 - 1
-            top_right_y, top_right_x = top_left_y, top_left_x + 1
-            bottom_left_y, bottom_left_x = top_left_y + 1, top_left_x
-            bottom_right_y, bottom_right_x = top_left_y + 1, top_left_x + 1
-
-            # place 2 black and 2 white pieces on the center
-            self._board[top_left_y][top_left_x] = WHITE
-            self._board[top_right_y][top_right_x] = BLACK
-            self._board[bottom_left_y][bottom_left_x] = BLACK
-            self._board[bottom_right_y][bottom_right_x] = WHITE
-
-            # update other attributes
+
+        if size in _STARTING_POSITIONS:
+            # the starting position and its valid moves are the same in every game
+            self._black, self._white, self._valid_moves_bb = _STARTING_POSITIONS[size]
             self._turn = BLACK
-            self._num_pieces = {BLACK: 2, WHITE: 2}
-            self._valid_moves = self._calculate_valid_moves(self._turn)
 
         else:
             raise ValueError
@@ -101,7 +142,23 @@ class ReversiGame:
 
         :return: a nested list representing the current board state
         """
-        return self._board
+        rows = _ROWS[self._size]
+        board = []
+        for y in range(0, self._size * 8, 8):
+            row_key = ((self._black >> y) & 0xff) << 8 | ((self._white >> y) & 0xff)
+            board.append(list(rows[row_key]))
+        return board
+
+    def get_flat_board(self) -> bytes:
+        """Return the current board state as a flat sequence of the pieces of the board, row
+        after row, where the piece at array indices (y, x) is at index y * size + x and is one
+        of FLAT_EMPTY, FLAT_BLACK and FLAT_WHITE.
+
+        :return: a bytes object representing the current board state
+        """
+        rows = _FLAT_ROWS[self._size]
+        return b''.join(rows[((self._black >> y) & 0xff) << 8 | ((self._white >> y) & 0xff)]
+                        for y in range(0, self._size * 8, 8))
 
     def get_board_size(self) -> int:
         """return the size of the board
@@ -115,7 +172,30 @@ class ReversiGame:
 
         :return: list of valid moves
         """
-        return self._valid_moves
+        valid_moves_so_far = [_ALG_FROM_SQ[square]
+                              for square in iter_squares(self._get_valid_moves_bb())]
+
+        # valid move is only pass when no valid moves
+        if len(valid_moves_so_far) == 0:
+            valid_moves_so_far.append('pass')
+
+        return valid_moves_so_far
+
+    def get_random_move(self, rng: random.Random) -> str:
+        """Return a random valid move for the active player, where every valid move is equally
+        likely to be chosen. This does not build the list of all valid moves.
+
+        :param rng: the random number generator used to choose the move
+        :return: a random valid move
+        """
+        valid_moves_bb = self._get_valid_moves_bb()
+        if valid_moves_bb == 0:
+            return 'pass'
+
+        # clear the k lowest set bits of the valid moves, and take the lowest remaining one
+        for _ in range(rng.randrange(popcount(valid_moves_bb))):
+            valid_moves_bb &= valid_moves_bb - 1
+        return _ALG_FROM_SQ[(valid_moves_bb & -valid_moves_bb).bit_length() - 1]
 
     def get_current_player(self) -> str:
         """Return which player is going to play next
@@ -129,21 +209,16 @@ class ReversiGame:
 
         :return: None
         """
-        print('*' * 26)
+        lines = [_BORDER,
+                 f'{BLACK}: {popcount(self._black)}, {WHITE}: {popcount(self._white)}',
+                 f"{self._turn}'s turn",
+                 _HEADERS[self._size]]
+        lines.extend(f'{i + 1}  ' + '  '.join(row)
+                     for i, row in enumerate(self.get_game_board()))
+        lines.append(_BORDER)
 
-        print(f'{BLACK}: {self._num_pieces[BLACK]}, {WHITE}: {self._num_pieces[WHITE]}')
-        print(f"{self._turn}'s turn")
-
-        if self._size == 8:
-            header = 'abcdefgh'
-        else:
-            header = 'abcdef'
-        print('   ' + '  '.join(list(header)))
-
-        for i in range(len(self._board)):
-            print(f'{i + 1}  ' + '  '.join(self._board[i]))
-
-        print('*' * 26)
+        # output the whole game state at once
+        print('\n'.join(lines))
 
     def make_move(self, move: str) -> None:
         """Make the given move and mutate the instance attributes of self such that
@@ -157,19 +232,10 @@ class ReversiGame:
         :param move: the move to be made
         :return: None
         """
-        if move not in self._valid_moves:
+        if not self._is_valid_move(move):
             raise ValueError(f'Move "{move}" is invalid')
 
-        self._update_board(self._turn, move)
-        self._next_player()
-        self._valid_moves = self._calculate_valid_moves(self._turn)
-
-    def _next_player(self) -> None:
-        """Mutate self.turn to the next player"""
-        if self._turn == BLACK:
-            self._turn = WHITE
-        else:
-            self._turn = BLACK
+        self._apply(move)
 
     def simulate_move(self, move: str) -> ReversiGame:
         """Make the given move in a copy of self, and return the copy after the move is made.
@@ -179,16 +245,42 @@ class ReversiGame:
         :param move: the move to be made
         :return: a copy of the game state after the move is made
         """
-        copy_state = copy.deepcopy(self)
-        copy_state.make_move(move)
+        if not self._is_valid_move(move):
+            raise ValueError(f'Move "{move}" is invalid')
+
+        copy_state = self._fast_clone()
+        copy_state._apply(move)
         return copy_state
 
+    @contextlib.contextmanager
+    def with_move(self, move: str) -> Iterator[ReversiGame]:
+        """Return a context manager which makes the given move on self when the with block is
+        entered, and undoes it when the block is left. Unlike simulate_move, this does not
+        create a new game state.
+
+        Only the moves made by this context manager can be undone, so the other ways of making
+        a move do not need to record anything to undo them.
+        If move is not a currently valid move, raise a ValueError.
+
+        :param move: the move to be made
+        :return: a context manager giving self after the move is made
+        """
+        if not self._is_valid_move(move):
+            raise ValueError(f'Move "{move}" is invalid')
+
+        valid_moves_bb = self._valid_moves_bb
+        placed, flips = self._apply(move)
+        try:
+            yield self
+        finally:
+            self._undo(placed, flips, valid_moves_bb)
+
     def get_num_pieces(self) -> dict[str, int]:
         """Return the number of piece of each color on the board.
 
         :return: a dictionary representing the number of pieces on each side
         """
-        return self._num_pieces
+        return {BLACK: popcount(self._black), WHITE: popcount(self._white)}
 
     def get_winner(self) -> Optional[str]:
         """Return the winner of the game (black or white) or 'draw' if the game ended in a draw.
@@ -198,9 +290,10 @@ class ReversiGame:
         :return: winner of the game (Black or White) or 'Draw' if the game ended in a draw.
         None if the game is not over.
         """
-        if self._calculate_valid_moves(BLACK) == ['pass'] \
-                and self._calculate_valid_moves(WHITE) == ['pass']:
-            num_black, num_white = self._num_pieces[BLACK], self._num_pieces[WHITE]
+        # the valid moves of the opponent only need to be checked when the active player passes
+        if self._get_valid_moves_bb() == 0 \
+                and self._calculate_valid_moves(_OPPONENT[self._turn]) == 0:
+            num_black, num_white = popcount(self._black), popcount(self._white)
             if num_black > num_white:
                 return BLACK
             elif num_white == num_black:
@@ -214,154 +307,123 @@ class ReversiGame:
         """getter method for self._size"""
         return self._size
 
-    def _update_board(self, turn: str, move: str) -> None:
-        """Mutate self._board after the given player made the move. Note that move can be 'pass'
+    def __copy__(self) -> ReversiGame:
+        """Return a copy of self. This is used by copy.copy."""
+        return self._fast_clone()
 
-        Preconditions:
-            - move is currently a legal move for the active player.
+    def __deepcopy__(self, memo: dict) -> ReversiGame:
+        """Return a copy of self. This is used by copy.deepcopy.
 
+        All the attributes of self are immutable, so the copy does not need to copy them.
         """
-        if move != 'pass':
-            # replace move position to the active player's piece
-            y_move, x_move = algebraic_to_index(move)
-            self._board[y_move][x_move] = turn
-
-            # flip all the pieces that could be flipped
-            flips_so_far = []
-            directions = [(0, 1), (0, -1), (1, 0), (-1, 0),
-                          (1, 1), (-1, 1), (1, -1), (-1, -1)]
-            for direction in directions:
-                flips_so_far.extend(self._check_flips(turn, move, direction))
-            for y, x in flips_so_far:
-                self._board[y][x] = turn
-
-            # update num pieces attribute
-            if turn == BLACK:
-                self._num_pieces[BLACK] += 1  # newly placed
-                self._num_pieces[BLACK] += len(flips_so_far)  # pieces gained from flip
-                self._num_pieces[WHITE] -= len(flips_so_far)  # pieces lost from flip
-            else:
-                self._num_pieces[WHITE] += 1
-                self._num_pieces[WHITE] += len(flips_so_far)
-                self._num_pieces[BLACK] -= len(flips_so_far)
+        return self._fast_clone()
+
+    def _fast_clone(self) -> ReversiGame:
+        """Return a copy of self, without going through the copy module."""
+        # the bitboards are immutable ints, so they can be shared with the copy
+        copy_state = ReversiGame.__new__(ReversiGame)
+        copy_state._size = self._size
+        copy_state._black = self._black
+        copy_state._white = self._white
+        copy_state._turn = self._turn
+        copy_state._valid_moves_bb = self._valid_moves_bb
+        return copy_state
 
-    def _calculate_valid_moves(self, turn: str) -> list[str]:
-        """Return all valid moves for the current board state for a given active player
+    def _apply(self, move: str) -> tuple[int, int]:
+        """Make the given move for the active player and pass the turn to the opponent.
+        Return the bitboard of the placed piece and the bitboard of the flipped pieces.
+
+        The valid moves of the opponent are only calculated once they are needed, since the
+        AIs discard many of the simulated game states without looking at their valid moves.
 
         Preconditions:
-            - turn in {BLACK, WHITE}
+            - move is currently a legal move for the active player.
 
-        :param turn: the active player making the move
-        :return: None
+        :param move: the move to be made
         """
-        valid_moves_so_far = []
-
-        # check every position for valid move
-        for y in range(len(self._board)):
-            for x in range(len(self._board)):
-                move = index_to_algebraic((y, x))
-                if self._is_valid_move(turn, move):
-                    valid_moves_so_far.append(move)
-
-        # valid move is only pass when no valid moves
-        if len(valid_moves_so_far) == 0:  # no valid moves
-            valid_moves_so_far.append('pass')
-
-        return valid_moves_so_far
-
-    def _is_valid_move(self, player: str, move: str) -> bool:
-        """Return whether the given move is valid for the given player.
+        placed, flips = self._update_board(self._turn, move)
+        self._turn = _OPPONENT[self._turn]
+        self._valid_moves_bb = None
+        return placed, flips
+
+    def _undo(self, placed: int, flips: int, valid_moves_bb: Optional[int]) -> None:
+        """Undo the last move made on self, given the bitboards returned by _apply for that
+        move and the _valid_moves_bb of self before that move.
+
+        :param placed: the bitboard of the piece placed by the move
+        :param flips: the bitboard of the pieces flipped by the move
+        :param valid_moves_bb: the _valid_moves_bb of self before the move
+        """
+        self._turn = _OPPONENT[self._turn]
+        if self._turn == BLACK:
+            self._black ^= placed | flips
+            self._white ^= flips
+        else:
+            self._white ^= placed | flips
+            self._black ^= flips
+        self._valid_moves_bb = valid_moves_bb
 
-         Preconditions:
-            - player in {BLACK, WHITE}
-            - move is a coordinate on the board
+    def _is_valid_move(self, move: str) -> bool:
+        """Return whether the given move is currently a valid move for the active player.
 
-        :param player: the player making the move
-        :param move: the move being made
-        :return: whether the given move is valid for the given player
+        :param move: the move to be checked
         """
-        # turn algebraic coordinate to array index
-        y, x = algebraic_to_index(move)
+        valid_moves_bb = self._get_valid_moves_bb()
+        if move == 'pass':
+            return valid_moves_bb == 0
+        else:
+            square = _SQ_FROM_ALG.get(move)
+            return square is not None and (valid_moves_bb >> square) & 1 == 1
 
-        # when that position is occupied, the move is invalid
-        if self._board[y][x] != EMPTY:
-            return False
+    def _get_valid_moves_bb(self) -> int:
+        """Return the bitboard of the valid moves other than pass of the active player,
+        calculating it if it has not been calculated yet.
+        """
+        if self._valid_moves_bb is None:
+            self._valid_moves_bb = self._calculate_valid_moves(self._turn)
+        return self._valid_moves_bb
 
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0),
-                      (1, 1), (-1, 1), (1, -1), (-1, -1)]
+    def _update_board(self, turn: str, move: str) -> tuple[int, int]:
+        """Mutate the bitboards after the given player made the move. Note that move can be 'pass'
 
-        # check all directions, if there is a flip, it is a valid move
-        for direction in directions:
-            if len(self._check_flips(player, move, direction)) != 0:
-                return True
+        Return the bitboard of the placed piece and the bitboard of the flipped pieces, which
+        are both empty if move is 'pass'.
 
-        # no flips if the function reaches this point, so the move is invalid
-        return False
+        Preconditions:
+            - move is currently a legal move for the active player.
 
-    def _check_flips(self, player: str, move: str, direction: tuple) -> list[tuple[int, int]]:
-        """Assume the player plays a given move, check the given direction for which pieces
-        can be flipped.
+        """
+        if move == 'pass':
+            return 0, 0
+        else:
+            square = _SQ_FROM_ALG[move]
 
-        direction[0] represents dy which is the proceeding direction of y.
-        direction[1] represents dx which is the proceeding direction of x.
-        For example, if player = BLACK, move = 'c4', direction =(0, 1), the function would
-        return a list of positions of white pieces that can be flipped on the right of c4
+            # place the active player's piece on the move and flip the enclosed pieces
+            if turn == BLACK:
+                flips = calculate_flips(self._black, self._white, square, self._size)
+                self._black ^= (1 << square) | flips
+                self._white ^= flips
+            else:
+                flips = calculate_flips(self._white, self._black, square, self._size)
+                self._white ^= (1 << square) | flips
+                self._black ^= flips
 
-        Preconditions:
-            - The square of move is empty
-            - player in {BLACK, WHITE}
-            - direction[0] in {-1, 0, 1}
-            - direction[1] in {-1, 0, 1}
-
-        :param player: the player playing the move
-        :param move: the move begin played
-        :param direction: the direction to be checked for flips
-        """
-        # process input
-        y, x = algebraic_to_index(move)
-        dy, dx = direction
+            return 1 << square, flips
 
-        # identify player pieces and opponent pieces
-        if player == BLACK:
-            opponent = WHITE
-        else:
-            opponent = BLACK
-
-        # check for special cases
-        if not self._is_on_board((y + dy, x + dx)):  # reach boarder in one step
-            return []
-        if not self._is_on_board((y + dy + dy, x + dx + dx)):  # reach boarder in two steps
-            return []
-        if self._board[y + dy][x + dx] != opponent:  # adjacent to player pieces in that direction
-            return []
-
-        assert 0 <= y + dy + dy <= self._size - 1
-        assert 0 <= x + dx + dx <= self._size - 1
-
-        y += dy
-        x += dx
-        assert self._board[y][x] == opponent
-
-        flips_so_far = []
-        while self._is_on_board((y, x)) and self._board[y][x] == opponent:
-            flips_so_far.append((y, x))
-            y += dy
-            x += dx
-
-        # determine what terminates the loop
-        if not self._is_on_board((y, x)):
-            return []
-        elif self._board[y][x] == player:
-            return flips_so_far
-        else:
-            return []
+    def _calculate_valid_moves(self, turn: str) -> int:
+        """Return the bitboard of all valid moves other than pass for the current board state
+        for a given active player
 
-    def _is_on_board(self, pos: tuple[int, int]) -> bool:
-        """Return whether coordinates in array indices pos is a valid position on the game board
+        Preconditions:
+            - turn in {BLACK, WHITE}
 
-        :param pos: coordinates in array indices
+        :param turn: the active player making the move
+        :return: the bitboard of the valid moves
         """
-        return 0 <= pos[0] <= self._size - 1 and 0 <= pos[1] <= self._size - 1
+        if turn == BLACK:
+            return calculate_moves(self._black, self._white, BOARD_MASKS[self._size])
+        else:
+            return calculate_moves(self._white, self._black, BOARD_MASKS[self._size])
 
 
 ################################################################################
@@ -371,7 +433,13 @@ class Player:
     """An abstract class representing a Reversi player.
 
     This class can be subclassed to implement different strategies for playing Reversi.
+
+    Class Attributes:
+        - STATELESS: whether the player keeps no state between moves, so that the same
+                     player can be used in several games without being copied
     """
+    __slots__ = ()
+    STATELESS: bool = False
 
     def make_move(self, game: ReversiGame, previous_move: Optional[str]) -> str:
         """Make a move given the current game.
@@ -389,6 +457,31 @@ class Player:
         """
         raise NotImplementedError
 
+    def clone(self) -> Player:
+        """Return a player which plays like this player did before its first move, to play a
+        new game with.
+
+        A stateless player is returned itself, since it can play any number of games, and any
+        other player is copied with copy.deepcopy.
+
+        :return: a player for a new game
+        """
+        if self.STATELESS:
+            return self
+        else:
+            return copy.deepcopy(self)
+
+    def stop(self) -> None:
+        """Ask the player to return as soon as possible from the make_move call it is running
+        on another thread. The move returned by that call is not meant to be played. The stop
+        only applies to that call, so the player plays normally in its later calls.
+
+        This does nothing by default, which is enough for the players choosing their moves
+        quickly. The players running long searches cut them short instead.
+
+        :return: None
+        """
+
 
 class ConsoleUserPlayer(Player):
     """A human player using the console for interaction."""
@@ -434,6 +527,19 @@ def view_valid_moves(game: ReversiGame) -> None:
 
 class RandomPlayer(Player):
     """A Reversi AI player who always picks a random move."""
+    # Private Instance Attributes:
+    #   - _rng: the random number generator owned by this player
+    __slots__ = ('_rng',)
+    STATELESS = True
+    _rng: random.Random
+
+    def __init__(self) -> None:
+        self._rng = random.Random()
+
+    def __reduce__(self) -> tuple:
+        """Return how to copy or pickle this player. The copy gets a newly seeded random number
+        generator, so that copies of the same player do not repeat the same sequence of moves"""
+        return (RandomPlayer, ())
 
     def make_move(self, game: ReversiGame, previous_move: Optional[str]) -> str:
         """Make a move given the current game.
@@ -449,8 +555,7 @@ class RandomPlayer(Player):
         have been made
         :return: a move to be made
         """
-        possible_moves = game.get_valid_moves()
-        return random.choice(possible_moves)
+        return game.get_random_move(self._rng)
 
 
 class GUIPlayer(Player):
@@ -470,7 +575,7 @@ if __name__ == '__main__':
 
     python_ta.contracts.check_all_contracts()
     python_ta.check_all(config={
-        'extra-imports': ['typing', 'copy', 'random', 'constants'],
+        'extra-imports': ['typing', 'contextlib', 'copy', 'random', 'constants', 'bitboard'],
         'allowed-io': ['view_valid_moves', 'print_game', 'view_valid_moves', 'make_move'],
         'max-line-length': 100,
         'disable': ['E1136']
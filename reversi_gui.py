@@ -16,14 +16,16 @@ Authors:
 
 This file is Copyright (c) 2021.
 """
-from typing import Optional, Union
+from typing import Callable, Optional, Union
+import bisect
+import concurrent.futures
 import pygame
 
 from mcts import MCTSTimeSavingPlayer
 
 from minimax_tree import MobilityTreePlayer, PositionalTreePlayer
 from reversi import RandomPlayer, ReversiGame
-from constants import BLACK, WHITE, INDEX_TO_COL, INDEX_TO_ROW
+from constants import BLACK, WHITE, FLAT_EMPTY, FLAT_BLACK, FLAT_WHITE, INDEX_TO_COL, INDEX_TO_ROW
 
 DEFAULT_DPI = (800, 800)
 DEFAULT_WH_RATIO = 1
@@ -69,6 +71,94 @@ BOARD_8 = {'a1': (65, 649), 'a2': (66, 563), 'a3': (67, 476), 'a4': (69, 392), '
 SIDE_8 = 80
 
 
+def _calculate_hit_table(board: dict[str, tuple[int, int]]) -> tuple:
+    """Return the table used by _search_for_move to find the square under a mouse position.
+
+    The table is a tuple (tops, rows), where tops are the sorted top edges of the rows of
+    squares, and rows[i] is a tuple (lefts, positions) of the sorted left edges and the names of
+    the squares with the top edge tops[i].
+
+    :param board: the top left corner of every square of the board
+    """
+    tops = sorted({corner[1] for corner in board.values()})
+    rows = []
+    for top in tops:
+        row = sorted((corner[0], position) for position, corner in board.items()
+                     if corner[1] == top)
+        rows.append((tuple(left for left, _ in row), tuple(position for _, position in row)))
+    return (tuple(tops), tuple(rows))
+
+
+def _calculate_piece_coordinates(board: dict[str, tuple[int, int]], size: int,
+                                 offset: int) -> tuple[tuple[int, int], ...]:
+    """Return the top left corner of the image of a piece on every square of the board, in the
+    same order as the squares of the board returned by ReversiGame.get_flat_board.
+
+    :param board: the top left corner of every square of the board
+    :param size: the size of the board
+    :param offset: the offset of a piece from the top left corner of its square
+    """
+    return tuple((board[INDEX_TO_COL[col] + INDEX_TO_ROW[row]][0] + offset,
+                  board[INDEX_TO_COL[col] + INDEX_TO_ROW[row]][1] + offset)
+                 for row in range(size) for col in range(size))
+
+
+# the hit table and the side of the squares of every board size, used by _search_for_move
+_HIT_TABLES = {6: (_calculate_hit_table(BOARD_6), SIDE_6),
+               8: (_calculate_hit_table(BOARD_8), SIDE_8)}
+# the coordinates of the pieces on every square of every board size, used by _draw_game_state
+_PIECE_COORDINATES = {6: _calculate_piece_coordinates(BOARD_6, 6, SIDE_6 // 5),
+                      8: _calculate_piece_coordinates(BOARD_8, 8, SIDE_8 // 6)}
+
+# the AI player chosen by each number returned by the menus, created by calling its factory
+_AI_FACTORY = {1: lambda: MobilityTreePlayer(3),
+               2: lambda: PositionalTreePlayer(3),
+               3: RandomPlayer,
+               4: lambda: MCTSTimeSavingPlayer(100, 8)}
+
+
+def _calculate_button_rect(left: int, right: int, top: int, bottom: int) -> pygame.Rect:
+    """Return the rect of a button of a menu, with all four given edges inside of the button.
+
+    :param left: the x coordinate of the left edge of the button
+    :param right: the x coordinate of the right edge of the button
+    :param top: the y coordinate of the top edge of the button
+    :param bottom: the y coordinate of the bottom edge of the button
+    """
+    return pygame.Rect(left, top, right - left + 1, bottom - top + 1)
+
+
+# the rect of every button of the menus, with the number returned when it is clicked
+_CHOOSE_AI_HITS = ((_calculate_button_rect(200, 606, 179, 250), 1),
+                   (_calculate_button_rect(200, 606, 282, 345), 2),
+                   (_calculate_button_rect(200, 606, 384, 451), 3),
+                   (_calculate_button_rect(200, 606, 490, 553), 4),
+                   (_calculate_button_rect(200, 606, 585, 652), 5),
+                   (_calculate_button_rect(200, 606, 683, 750), 0))
+_CHOOSE_AI_1AND2_HITS = tuple(hit for hit in _CHOOSE_AI_HITS if hit[1] != 5)
+_CHOOSE_BOARD_HITS = ((_calculate_button_rect(200, 606, 188, 255), 6),
+                      (_calculate_button_rect(200, 606, 310, 377), 8),
+                      (_calculate_button_rect(200, 606, 435, 500), 0))
+
+# the rect of the button which leaves a game against the AI
+_LEAVE_GAME_RECT = _calculate_button_rect(585, 795, 10, 41)
+
+# the types of the events handled by the menus and the games. MOUSEMOTION is only handled by
+# the main menu, which allows it while it is shown
+_HANDLED_EVENTS = [pygame.QUIT, pygame.MOUSEBUTTONDOWN]
+
+# the images used by the GUI, loaded once by _load_assets after the display is created
+_ASSETS = {}
+# the names of the images in assets/ without transparency
+_OPAQUE_ASSETS = ('main_menu', 'choose_ai_menu', 'choose_ai_1', 'choose_ai_2', 'choose_board_menu',
+                  'gameboard6', 'gameboard8')
+# the names of the images in assets/ with transparency
+_TRANSPARENT_ASSETS = ('start_button', 'quit_button', 'button_down', 'pass', 'victory', 'defeat',
+                       'draw', 'player1_victory', 'player2_victory')
+# the names of the images of the pieces in assets/chess/
+_CHESS_ASSETS = ('black6', 'black8', 'white6', 'white8')
+
+
 def run_reversi_game(dpi: tuple = DEFAULT_DPI) -> None:
     """Call this function directly to start the reversi game window.
     This is the main thread of the game process.
@@ -81,21 +171,17 @@ def run_reversi_game(dpi: tuple = DEFAULT_DPI) -> None:
         print('fail to load display')
         return
     game_surface = pygame.display.set_mode(dpi)
+    _load_assets()
+    # only queue the events handled by the GUI, so that pygame.event.wait in the menus and the
+    # games keeps sleeping through the other events, like key presses and window events
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(_HANDLED_EVENTS)
     while True:
         result = _main_menu(game_surface)
         if result == 1:
             while True:
-                player = RandomPlayer()
                 ai_num = _choose_ai_menu(game_surface)
-                if ai_num == 1:
-                    player = MobilityTreePlayer(3)
-                elif ai_num == 2:
-                    player = PositionalTreePlayer(3)
-                elif ai_num == 3:
-                    player = RandomPlayer()
-                elif ai_num == 4:
-                    player = MCTSTimeSavingPlayer(100, 8)
-                elif ai_num == 5:
+                if ai_num == 5:
                     players = _choose_ai1(game_surface)
                     if players == ():
                         continue
@@ -112,6 +198,7 @@ def run_reversi_game(dpi: tuple = DEFAULT_DPI) -> None:
 
                 elif ai_num == 0:
                     break
+                player = _AI_FACTORY.get(ai_num, RandomPlayer)()
                 board_size = _choose_board_menu(game_surface)
                 if board_size == 6:
                     _run_ai_game(game_surface, 6, player)
@@ -127,49 +214,84 @@ def run_reversi_game(dpi: tuple = DEFAULT_DPI) -> None:
     return
 
 
+def _load_assets() -> None:
+    """Load every image used by the GUI into _ASSETS.
+
+    The images are converted to the pixel format of the display once here, so that they are
+    not decoded again for every menu and every move, and blitting them needs no conversion.
+
+    Preconditions:
+        - the display mode has been set
+    """
+    for name in _OPAQUE_ASSETS:
+        _ASSETS[name] = pygame.image.load(f'assets/{name}.png').convert()
+    for name in _TRANSPARENT_ASSETS:
+        _ASSETS[name] = pygame.image.load(f'assets/{name}.png').convert_alpha()
+    for name in _CHESS_ASSETS:
+        _ASSETS[name] = pygame.image.load(f'assets/chess/{name}.png').convert_alpha()
+        # the pieces are blitted the most, and are mostly transparent around the piece, so they
+        # are run-length encoded to skip the transparent pixels when they are blitted
+        _ASSETS[name].set_alpha(255, pygame.RLEACCEL)
+
+
 def _main_menu(game_surface: pygame.Surface) -> int:
-    background = pygame.image.load('assets/main_menu.png')
+    # the other menus and the games do not wake up for every movement of the mouse
+    pygame.event.set_allowed(pygame.MOUSEMOTION)
+
+    background = _ASSETS['main_menu']
     game_surface.blit(background, (0, 0))
 
-    start_button = pygame.image.load('assets/start_button.png')
+    start_button = _ASSETS['start_button']
     game_surface.blit(start_button, (250, 320))
-    start_button_area = ((255, 250 + BUTTON_SIZE[0] - 5), (325, 320 + BUTTON_SIZE[1] - 5))
-    # start_button_rect = pygame.Rect(255, 325, BUTTON_SIZE[0] - 5, BUTTON_SIZE[1] - 5)
-    quit_button = pygame.image.load('assets/quit_button.png')
+    start_button_rect = _calculate_button_rect(255, 250 + BUTTON_SIZE[0] - 5,
+                                               325, 320 + BUTTON_SIZE[1] - 5)
+    quit_button = _ASSETS['quit_button']
     game_surface.blit(quit_button, (250, 380))
-    quit_button_area = ((255, 250 + BUTTON_SIZE[0] - 5), (385, 380 + BUTTON_SIZE[1] - 5))
-    # quit_button_rect = pygame.Rect(255, 385, BUTTON_SIZE[0] - 5, BUTTON_SIZE[1] - 5)
+    quit_button_rect = _calculate_button_rect(255, 250 + BUTTON_SIZE[0] - 5,
+                                              385, 380 + BUTTON_SIZE[1] - 5)
 
     original_surface = game_surface.copy()
-    button_down = pygame.image.load('assets/button_down.png')
+    button_down = _ASSETS['button_down']
     pygame.display.flip()
 
+    # the button under the mouse, so that the menu is only redrawn when the mouse moves on or
+    # off a button, instead of on every motion event
+    current_hot = None
+    # the area of each button covered by the image of a pressed button
+    button_rects = {'start': pygame.Rect((250, 320), button_down.get_size()),
+                    'quit': pygame.Rect((250, 380), button_down.get_size())}
     while True:
         event = pygame.event.wait()
-        # The code in this if check has problems yet to be found.
         if event.type == pygame.MOUSEMOTION:
-            mouse_pos = pygame.mouse.get_pos()
-            if start_button_area[0][0] <= mouse_pos[0] <= start_button_area[0][1] and \
-                    start_button_area[1][0] <= mouse_pos[1] <= start_button_area[1][1]:
-                game_surface.blit(button_down, (250, 320))
-                pygame.display.flip()
-                continue
-            if quit_button_area[0][0] <= mouse_pos[0] <= quit_button_area[0][1] and \
-                    quit_button_area[1][0] <= mouse_pos[1] <= quit_button_area[1][1]:
-                game_surface.blit(button_down, (250, 380))
-                pygame.display.flip()
-                continue
+            mouse_pos = event.pos
+            if start_button_rect.collidepoint(mouse_pos):
+                new_hot = 'start'
+            elif quit_button_rect.collidepoint(mouse_pos):
+                new_hot = 'quit'
             else:
-                game_surface = original_surface
-                pygame.display.flip()
+                new_hot = None
+            if new_hot == current_hot:
                 continue
+
+            # only redraw and update the areas of the buttons the mouse moved off and on
+            rects = []
+            if current_hot is not None:
+                rect = button_rects[current_hot]
+                game_surface.blit(original_surface, rect, rect)
+                rects.append(rect)
+            if new_hot is not None:
+                rect = button_rects[new_hot]
+                game_surface.blit(button_down, rect)
+                rects.append(rect)
+            pygame.display.update(rects)
+            current_hot = new_hot
+            continue
         if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = pygame.mouse.get_pos()
-            if start_button_area[0][0] <= mouse_pos[0] <= start_button_area[0][1] and \
-                    start_button_area[1][0] <= mouse_pos[1] <= start_button_area[1][1]:
+            mouse_pos = event.pos
+            if start_button_rect.collidepoint(mouse_pos):
+                pygame.event.set_blocked(pygame.MOUSEMOTION)
                 return 1
-            if quit_button_area[0][0] <= mouse_pos[0] <= quit_button_area[0][1] and \
-                    quit_button_area[1][0] <= mouse_pos[1] <= quit_button_area[1][1]:
+            if quit_button_rect.collidepoint(mouse_pos):
                 pygame.quit()
                 return -1
             else:
@@ -179,81 +301,49 @@ def _main_menu(game_surface: pygame.Surface) -> int:
 
 
 def _choose_ai_menu(game_surface: pygame.Surface) -> int:
-    background = pygame.image.load('assets/choose_ai_menu.png')
+    background = _ASSETS['choose_ai_menu']
     game_surface.blit(background, (0, 0))
     pygame.display.flip()
     while True:
         event = pygame.event.wait()
         if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = pygame.mouse.get_pos()
-            if 200 <= mouse_pos[0] <= 606:
-                if 179 <= mouse_pos[1] <= 250:
-                    return 1
-                elif 282 <= mouse_pos[1] <= 345:
-                    return 2
-                elif 384 <= mouse_pos[1] <= 451:
-                    return 3
-                elif 490 <= mouse_pos[1] <= 553:
-                    return 4
-                elif 585 <= mouse_pos[1] <= 652:
-                    return 5
-                elif 683 <= mouse_pos[1] <= 750:
-                    return 0
-            else:
-                continue
+            mouse_pos = event.pos
+            for rect, choice in _CHOOSE_AI_HITS:
+                if rect.collidepoint(mouse_pos):
+                    return choice
         elif event.type == pygame.QUIT:
             return -1
 
 
 def _choose_ai_1and2(number: int, game_surface: pygame.Surface) -> int:
     if number == 1:
-        file = 'assets/choose_ai_1.png'
+        background = _ASSETS['choose_ai_1']
     elif number == 2:
-        file = 'assets/choose_ai_2.png'
+        background = _ASSETS['choose_ai_2']
     else:
         raise ValueError
-    background = pygame.image.load(file)
     game_surface.blit(background, (0, 0))
     pygame.display.flip()
     while True:
         event = pygame.event.wait()
         if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = pygame.mouse.get_pos()
-            if 200 <= mouse_pos[0] <= 606:
-                if 179 <= mouse_pos[1] <= 250:
-                    return 1
-                elif 282 <= mouse_pos[1] <= 345:
-                    return 2
-                elif 384 <= mouse_pos[1] <= 451:
-                    return 3
-                elif 490 <= mouse_pos[1] <= 553:
-                    return 4
-                elif 683 <= mouse_pos[1] <= 750:
-                    return 0
-            else:
-                continue
+            mouse_pos = event.pos
+            for rect, choice in _CHOOSE_AI_1AND2_HITS:
+                if rect.collidepoint(mouse_pos):
+                    return choice
         elif event.type == pygame.QUIT:
             return -1
 
 
 def _choose_ai1(game_surface: pygame.surface) -> tuple:
     while True:
-        player1 = RandomPlayer()
         ai_1 = _choose_ai_1and2(1, game_surface)
         if ai_1 == 0:
             return ()
-        elif ai_1 == 1:
-            player1 = MobilityTreePlayer(3)
-        elif ai_1 == 2:
-            player1 = PositionalTreePlayer(3)
-        elif ai_1 == 3:
-            player1 = RandomPlayer()
-        elif ai_1 == 4:
-            player1 = MCTSTimeSavingPlayer(100, 8)
         player2 = _choose_ai2(game_surface)
         if player2 is None:
             continue
-        return (player1, player2)
+        return (_AI_FACTORY.get(ai_1, RandomPlayer)(), player2)
 
 
 def _choose_ai2(game_surface: pygame.surface) -> Optional[Union[MobilityTreePlayer,
@@ -263,33 +353,21 @@ def _choose_ai2(game_surface: pygame.surface) -> Optional[Union[MobilityTreePlay
         ai_2 = _choose_ai_1and2(2, game_surface)
         if ai_2 == 0:
             return None
-        elif ai_2 == 1:
-            return MobilityTreePlayer(3)
-        elif ai_2 == 2:
-            return PositionalTreePlayer(3)
-        elif ai_2 == 3:
-            return RandomPlayer()
-        elif ai_2 == 4:
-            return MCTSTimeSavingPlayer(100, 8)
+        elif ai_2 in _AI_FACTORY:
+            return _AI_FACTORY[ai_2]()
 
 
 def _choose_board_menu(game_surface: pygame.Surface) -> int:
-    background = pygame.image.load('assets/choose_board_menu.png')
+    background = _ASSETS['choose_board_menu']
     game_surface.blit(background, (0, 0))
     pygame.display.flip()
     while True:
         event = pygame.event.wait()
         if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = pygame.mouse.get_pos()
-            if 200 <= mouse_pos[0] <= 606:
-                if 188 <= mouse_pos[1] <= 255:
-                    return 6
-                elif 310 <= mouse_pos[1] <= 377:
-                    return 8
-                elif 435 <= mouse_pos[1] <= 500:
-                    return 0
-            else:
-                continue
+            mouse_pos = event.pos
+            for rect, choice in _CHOOSE_BOARD_HITS:
+                if rect.collidepoint(mouse_pos):
+                    return choice
         elif event.type == pygame.QUIT:
             return -1
 
@@ -298,92 +376,23 @@ def _run_ai_game(game_surface: pygame.Surface, size: int,
                  ai_player: Union[MobilityTreePlayer, PositionalTreePlayer, RandomPlayer,
                                   ReversiGame, MCTSTimeSavingPlayer],
                  user_side: str = BLACK) -> None:
-    if size == 8:
-        background = pygame.image.load('assets/gameboard8.png')
-    elif size == 6:
-        background = pygame.image.load('assets/gameboard6.png')
-    else:
-        raise ValueError("invalid size.")
-    game_surface.blit(background, (0, 0))
-    pygame.display.flip()
-    game = ReversiGame(size)
-    previous_move = '*'
     if user_side == BLACK:
         ai_side: str = WHITE
     else:
         ai_side: str = BLACK
-    board = game.get_game_board()
-    _draw_game_state(game_surface, background, size, board)
-
-    pass_move = pygame.image.load('assets/pass.png')
 
-    while game.get_winner() is None:
+    def get_move(game: ReversiGame, previous_move: str) -> Optional[tuple[str, int]]:
         if (previous_move == '*' and user_side == WHITE) or game.get_current_player() == user_side:
             if game.get_valid_moves() == ['pass']:
-                game.make_move('pass')
-                previous_move = 'pass'
-
-                surface = game_surface
-                game_surface.blit(pass_move, (300, 300))
-                pygame.display.flip()
-                pygame.time.wait(1000)
-                game_surface.blit(surface, (0, 0))
-                pygame.display.flip()
-
-                continue
-            while True:
-                event = pygame.event.wait()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
-                    if 585 <= mouse_pos[0] <= 795 and 10 <= mouse_pos[1] <= 41:
-                        return
-                    else:
-                        move = _search_for_move(mouse_pos, size)
-                        print(move)
-                        if move == '' or move not in game.get_valid_moves():
-                            continue
-                        else:
-                            previous_move = move
-                            game.make_move(move)
-                            board = game.get_game_board()
-                            _draw_game_state(game_surface, background, size, board)
-                            pygame.time.wait(1000)
-                            break
-                if event.type == pygame.QUIT:
-                    return
+                return ('pass', 0)
+            move = _wait_for_user_move(game, size)
         else:
-            move = ai_player.make_move(game, previous_move)
-            previous_move = move
-            game.make_move(move)
-            if move == 'pass':
-                surface = game_surface
-                game_surface.blit(pass_move, (300, 300))
-                pygame.display.flip()
-                pygame.time.wait(1000)
-                game_surface.blit(surface, (0, 0))
-                pygame.display.flip()
-            else:
-                board = game.get_game_board()
-                _draw_game_state(game_surface, background, size, board)
-    winner = game.get_winner()
-    if winner == user_side:
-        victory = pygame.image.load('assets/victory.png')
-        game_surface.blit(victory, (300, 300))
-        pygame.display.flip()
-        pygame.time.wait(3000)
-        return
-    elif winner == ai_side:
-        defeat = pygame.image.load('assets/defeat.png')
-        game_surface.blit(defeat, (300, 300))
-        pygame.display.flip()
-        pygame.time.wait(3000)
-        return
-    else:
-        draw = pygame.image.load('assets/draw.png')
-        game_surface.blit(draw, (300, 300))
-        pygame.display.flip()
-        pygame.time.wait(3000)
-        return
+            move = _wait_for_ai_move(ai_player, game, previous_move)
+        if move is None:
+            return None
+        return (move, 0)
+
+    _play_game(game_surface, size, get_move, 1000, {user_side: 'victory', ai_side: 'defeat'})
 
 
 def _run_ai_simulation(game_surface: pygame.Surface, size: int,
@@ -391,104 +400,238 @@ def _run_ai_simulation(game_surface: pygame.Surface, size: int,
                                       ReversiGame, MCTSTimeSavingPlayer],
                        player2: Union[MobilityTreePlayer, PositionalTreePlayer, RandomPlayer,
                                       ReversiGame, MCTSTimeSavingPlayer]) -> None:
+    player1_side = BLACK
+
+    def get_move(game: ReversiGame, previous_move: str) -> Optional[tuple[str, int]]:
+        if previous_move == '*' or game.get_current_player() == player1_side:
+            move = _wait_for_ai_move(player1, game, previous_move)
+        else:
+            move = _wait_for_ai_move(player2, game, previous_move)
+        if move is None:
+            return None
+        return (move, 500)
+
+    _play_game(game_surface, size, get_move, 500,
+               {BLACK: 'player1_victory', WHITE: 'player2_victory'})
+
+
+def _play_game(game_surface: pygame.Surface, size: int,
+               get_move: Callable[[ReversiGame, str], Optional[tuple[str, int]]],
+               pass_ms: int, results: dict[str, str]) -> None:
+    """Play a game of Reversi on the window until it is over or left, drawing every move.
+
+    get_move is called with the game and the previous move to get the next move, and returns the
+    move and the number of milliseconds to wait after drawing it, or None to leave the game.
+
+    :param game_surface: the surface of the window
+    :param size: the size of the board
+    :param get_move: the function choosing the next move of the game
+    :param pass_ms: the number of milliseconds to show the pass image for after a pass
+    :param results: the name of the image shown at the end of the game for each winner, where
+                    the draw image is shown for any other result
+    """
     if size == 8:
-        background = pygame.image.load('assets/gameboard8.png')
+        background = _ASSETS['gameboard8']
     elif size == 6:
-        background = pygame.image.load('assets/gameboard6.png')
+        background = _ASSETS['gameboard6']
     else:
         raise ValueError("invalid size.")
-    game_surface.blit(background, (0, 0))
-    pygame.display.flip()
     game = ReversiGame(size)
     previous_move = '*'
-    board = game.get_game_board()
+    board = game.get_flat_board()
     _draw_game_state(game_surface, background, size, board)
-    pass_move = pygame.image.load('assets/pass.png')
-    player1_side = BLACK
+
     while game.get_winner() is None:
-        if previous_move == '*' or game.get_current_player() == player1_side:
-            move = player1.make_move(game, previous_move)
-        else:
-            move = player2.make_move(game, previous_move)
+        next_move = get_move(game, previous_move)
+        if next_move is None:
+            return
+        move, ms = next_move
         previous_move = move
         game.make_move(move)
         if move == 'pass':
-            surface = game_surface
-            game_surface.blit(pass_move, (300, 300))
-            pygame.display.flip()
-            pygame.time.wait(500)
-            game_surface.blit(surface, (0, 0))
-            pygame.display.flip()
+            if _show_pass(game_surface, pass_ms):
+                return
         else:
-            board = game.get_game_board()
-            _draw_game_state(game_surface, background, size, board)
-        pygame.time.wait(500)
-    winner = game.get_winner()
-    if winner == BLACK:
-        victory = pygame.image.load('assets/player1_victory.png')
-        game_surface.blit(victory, (300, 300))
-        pygame.display.flip()
-        pygame.time.wait(3000)
-        return
-    elif winner == WHITE:
-        defeat = pygame.image.load('assets/player2_victory.png')
-        game_surface.blit(defeat, (300, 300))
-        pygame.display.flip()
-        pygame.time.wait(3000)
-        return
-    else:
-        draw = pygame.image.load('assets/draw.png')
-        game_surface.blit(draw, (300, 300))
-        pygame.display.flip()
-        pygame.time.wait(3000)
-        return
+            new_board = game.get_flat_board()
+            _draw_game_state(game_surface, background, size, new_board,
+                             _find_dirty_cells(board, new_board))
+            board = new_board
+        if ms > 0 and _idle(ms):
+            return
+
+    result = _ASSETS[results.get(game.get_winner(), 'draw')]
+    rect = pygame.Rect((300, 300), result.get_size())
+    game_surface.blit(result, rect)
+    pygame.display.update(rect)
+    _idle(3000)
+
+
+def _wait_for_user_move(game: ReversiGame, size: int) -> Optional[str]:
+    """Wait for the user to click on a valid move of the game and return it, or return None if
+    the user leaves the game or closes the window.
+
+    :param game: the game the user is playing
+    :param size: the size of the board
+    """
+    # the valid moves do not change until the user makes one of them
+    valid_moves = set(game.get_valid_moves())
+    while True:
+        event = pygame.event.wait()
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            mouse_pos = event.pos
+            if _LEAVE_GAME_RECT.collidepoint(mouse_pos):
+                return None
+            else:
+                move = _search_for_move(mouse_pos, size)
+                print(move)
+                if move not in valid_moves:
+                    continue
+                else:
+                    return move
+        if event.type == pygame.QUIT:
+            return None
+
+
+def _wait_for_ai_move(player: Union[MobilityTreePlayer, PositionalTreePlayer, RandomPlayer,
+                                    ReversiGame, MCTSTimeSavingPlayer],
+                      game: ReversiGame, previous_move: str) -> Optional[str]:
+    """Let the AI player choose its move on another thread and return it, or return None if the
+    user leaves the game or closes the window in the meantime.
+
+    The events of the window are handled while the player is thinking, so the window stays
+    responsive during long searches. When the game is left, the player is stopped and its thread
+    is waited for, so no search keeps running in the background. An error raised by the player
+    is raised again here.
+
+    :param player: the AI player choosing the move
+    :param game: the game the player is playing, which is not used elsewhere in the meantime
+    :param previous_move: the move made before the move of the player
+    """
+    # leaving the with block waits for the thread of the player to finish
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(player.make_move, game, previous_move)
+        clock = pygame.time.Clock()
+        while not future.done():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.MOUSEBUTTONDOWN
+                                                 and _LEAVE_GAME_RECT.collidepoint(event.pos)):
+                    player.stop()
+                    return None
+            clock.tick(30)
+        return future.result()
+
+
+def _show_pass(game_surface: pygame.Surface, ms: int) -> bool:
+    """Show the pass image over the board for the given number of milliseconds, then restore
+    the part of the board it covered, and return whether the window was closed in the meantime.
+
+    Only the area of the pass image is saved, drawn and updated on the screen.
+
+    :param game_surface: the surface of the window
+    :param ms: the number of milliseconds to show the pass image for
+    :return: whether a QUIT event was received
+    """
+    pass_move = _ASSETS['pass']
+    rect = pygame.Rect((300, 300), pass_move.get_size())
+    covered = game_surface.subsurface(rect).copy()
+    game_surface.blit(pass_move, rect)
+    pygame.display.update(rect)
+    if _idle(ms):
+        return True
+    game_surface.blit(covered, rect)
+    pygame.display.update(rect)
+    return False
+
+
+def _idle(ms: int) -> bool:
+    """Wait for the given number of milliseconds while still handling the events of the window,
+    and return whether the window was closed in the meantime.
+
+    Unlike pygame.time.wait, this keeps the window responsive while waiting.
+
+    :param ms: the number of milliseconds to wait
+    :return: whether a QUIT event was received
+    """
+    clock = pygame.time.Clock()
+    end = pygame.time.get_ticks() + ms
+    while pygame.time.get_ticks() < end:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return True
+        clock.tick(60)
+    return False
 
 
 def _search_for_move(mouse_pos: tuple, board_size: int) -> str:
+    if board_size not in _HIT_TABLES:
+        raise ValueError
+    (tops, rows), side = _HIT_TABLES[board_size]
     x = mouse_pos[0]
     y = mouse_pos[1]
-    if board_size == 6:
-        board = BOARD_6
-    elif board_size == 8:
-        board = BOARD_8
+
+    # find the row, and then the square in the row, with the last edge before the position
+    row_index = bisect.bisect_right(tops, y) - 1
+    if row_index < 0 or y > tops[row_index] + side:
+        return ''
+    lefts, positions = rows[row_index]
+    col_index = bisect.bisect_right(lefts, x) - 1
+    if col_index < 0 or x > lefts[col_index] + side:
+        return ''
+    return positions[col_index]
+
+
+def _find_dirty_cells(old_board: bytes, new_board: bytes) -> list[int]:
+    """Return the index of every square which is different on the two flat boards.
+
+    :param old_board: the flat board currently drawn on the screen
+    :param new_board: the flat board to draw
+    """
+    return [i for i in range(len(new_board)) if old_board[i] != new_board[i]]
+
+
+def _blit_pieces(game_surface: pygame.Surface, pieces: list) -> None:
+    """Draw all the given pieces on the surface with a single call, instead of calling blit for
+    every piece.
+
+    pygame-ce has Surface.fblits, which skips the checks and the return value of Surface.blits.
+
+    :param game_surface: the surface to draw on
+    :param pieces: the image and the coordinates of every piece to draw
+    """
+    if hasattr(game_surface, 'fblits'):
+        game_surface.fblits(pieces)
     else:
-        raise ValueError
-    for position in board:
-        left = board[position][0]
-        right = left + SIDE_6
-        up = board[position][1]
-        down = up + SIDE_6
-        if left <= x <= right and up <= y <= down:
-            return position
-    return ''
+        game_surface.blits(pieces, False)
 
 
 def _draw_game_state(game_surface: pygame.Surface, background: pygame.Surface, size: int,
-                     board: list) -> None:
+                     board: bytes, dirty_cells: Optional[list[int]] = None) -> None:
+    if size == 6:
+        images = {FLAT_BLACK: _ASSETS['black6'], FLAT_WHITE: _ASSETS['white6']}
+    else:
+        images = {FLAT_BLACK: _ASSETS['black8'], FLAT_WHITE: _ASSETS['white8']}
+    coordinates = _PIECE_COORDINATES[size]
+
+    if dirty_cells is not None:
+        # only redraw the background and the piece of the squares which changed, and only
+        # update their part of the screen
+        piece_size = images[FLAT_BLACK].get_size()
+        rects = []
+        pieces = []
+        for i in dirty_cells:
+            rect = pygame.Rect(coordinates[i], piece_size)
+            game_surface.blit(background, rect, rect)
+            if board[i] != FLAT_EMPTY:
+                pieces.append((images[board[i]], rect))
+            rects.append(rect)
+        _blit_pieces(game_surface, pieces)
+        pygame.display.update(rects)
+        return
+
     game_surface.blit(background, (0, 0))
-    pygame.display.flip()
-    black_chess6 = pygame.image.load('assets/chess/black6.png')
-    black_chess8 = pygame.image.load('assets/chess/black8.png')
-    white_chess6 = pygame.image.load('assets/chess/white6.png')
-    white_chess8 = pygame.image.load('assets/chess/white8.png')
-    for row_num in range(0, len(board)):
-        for col_num in range(0, len(board)):
-            if board[row_num][col_num] == BLACK:
-                pos = INDEX_TO_COL[col_num] + INDEX_TO_ROW[row_num]
-                if size == 6:
-                    coordinates = (BOARD_6[pos][0] + SIDE_6 // 5, BOARD_6[pos][1] + SIDE_6 // 5)
-                    game_surface.blit(black_chess6, coordinates)
-                else:
-                    coordinates = (BOARD_8[pos][0] + SIDE_8 // 6, BOARD_8[pos][1] + SIDE_8 // 6)
-                    game_surface.blit(black_chess8, coordinates)
-            elif board[row_num][col_num] == WHITE:
-                pos = INDEX_TO_COL[col_num] + INDEX_TO_ROW[row_num]
-                if size == 6:
-                    coordinates = (BOARD_6[pos][0] + SIDE_6 // 5, BOARD_6[pos][1] + SIDE_6 // 5)
-                    game_surface.blit(white_chess6, coordinates)
-                else:
-                    coordinates = (BOARD_8[pos][0] + SIDE_8 // 6, BOARD_8[pos][1] + SIDE_8 // 6)
-                    game_surface.blit(white_chess8, coordinates)
+    _blit_pieces(game_surface, [(images[piece], piece_coordinates)
+                                for piece, piece_coordinates in zip(board, coordinates)
+                                if piece != FLAT_EMPTY])
     pygame.display.flip()
     return
 
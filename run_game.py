@@ -13,9 +13,11 @@ Authors:
 This file is Copyright (c) 2021.
 """
 import copy
+import multiprocessing
 import time
 
 import tkinter as tk
+import numpy
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
@@ -23,6 +25,9 @@ from simple_tk_gui import ReversiVisualizer
 from constants import BLACK, WHITE, DEFAULT_FPS
 from reversi import ReversiGame, Player
 
+# the players of run_games_ai in a worker process, keyed by 'P1' and 'P2'
+_WORKER_PLAYERS = {}
+
 
 def run_game_visual(player1: Player, player2: Player, size: int, fps: int = DEFAULT_FPS) -> None:
     """Run a reversi game using the given players and show a visual"""
@@ -35,17 +40,27 @@ def run_game_visual(player1: Player, player2: Player, size: int, fps: int = DEFA
 def run_games_ai(player1: Player, player2: Player, n: int, size: int,
                  show_stats: bool = False) -> None:
     """Run n games using the given Players.
+
+    The games are independent, so they are played in parallel by a pool of worker processes,
+    each of which receives its own copy of the players. Players which are not stateless are
+    copied again for every game.
+
     Preconditions:
         - n >= 1
     """
     stats = {'P1': 0, 'P2': 0, 'Draw': 0}
     results = []
-    for i in range(0, n):
-        # switch black and white every turn
+
+    # switch black and white every turn, p1 is black in odd games and white in even games
+    games = [('P1', 'P2', size) if i % 2 else ('P2', 'P1', size) for i in range(n)]
+    # no more workers than games, so that a short run does not start idle processes
+    processes = min(n, multiprocessing.cpu_count())
+    with multiprocessing.Pool(processes, initializer=_init_worker,
+                              initargs=(player1, player2)) as pool:
+        winners = pool.starmap(_run_game_winner, games)
+
+    for i, winner in enumerate(winners):
         if i % 2:  # p1 black, p2 white
-            black_copy = copy.deepcopy(player1)
-            white_copy = copy.deepcopy(player2)
-            winner, _ = run_game(black_copy, white_copy, size)
             print(f'Game {i}, P1 as {BLACK}, P2 as {WHITE}, ', end='')
 
             if winner == BLACK:
@@ -56,9 +71,6 @@ def run_games_ai(player1: Player, player2: Player, n: int, size: int,
                 win_player = 'Draw'
 
         else:  # p2 black, p1 white
-            black_copy = copy.deepcopy(player2)
-            white_copy = copy.deepcopy(player1)
-            winner, _ = run_game(black_copy, white_copy, size)
             print(f'Game {i}, P1 as {WHITE}, P2 as {BLACK}, ', end='')
 
             if winner == BLACK:
@@ -79,6 +91,31 @@ def run_games_ai(player1: Player, player2: Player, n: int, size: int,
         plot_game_statistics(results)
 
 
+def _init_worker(player1: Player, player2: Player) -> None:
+    """Initialize a worker process of run_games_ai with its own copy of the players.
+
+    A forked worker inherits the players of the parent process as they are, random number
+    generators included, so the players are copied here, which gives every RandomPlayer a
+    newly seeded generator. The numpy random number generator is reseeded for the same reason,
+    so that forked workers do not share the same random state.
+    """
+    numpy.random.seed()
+    _WORKER_PLAYERS['P1'] = copy.deepcopy(player1)
+    _WORKER_PLAYERS['P2'] = copy.deepcopy(player2)
+
+
+def _run_game_winner(black: str, white: str, size: int) -> str:
+    """Run a Reversi game between the two given players of the worker process and return
+    the winner. This is the task run by the worker processes of run_games_ai.
+
+    Preconditions:
+        - black in {'P1', 'P2'}
+        - white in {'P1', 'P2'}
+    """
+    black_player, white_player = _WORKER_PLAYERS[black].clone(), _WORKER_PLAYERS[white].clone()
+    return run_game(black_player, white_player, size)[0]
+
+
 def run_game(black: Player, white: Player, size: int,
              verbose: bool = False) -> tuple[str, list[str]]:
     """Run a Reversi game between the two given players.
@@ -158,9 +195,9 @@ if __name__ == '__main__':
     python_ta.contracts.check_all_contracts()
 
     python_ta.check_all(config={
-        'extra-imports': ['tkinter', 'time', 'old_tk_gui', 'copy', 'plotly', 'minimax_tree',
-                          'constants', 'simple_tk_gui', 'plotly.graph_objects', 'plotly.subplots',
-                          'reversi'],
+        'extra-imports': ['copy', 'tkinter', 'time', 'old_tk_gui', 'multiprocessing', 'numpy',
+                          'plotly', 'minimax_tree', 'constants', 'simple_tk_gui',
+                          'plotly.graph_objects', 'plotly.subplots', 'reversi'],
         'allowed-io': ['run_game', 'run_games_ai'],
         'max-line-length': 100,
         'disable': ['E1136', 'R0913']